@@ -10,23 +10,31 @@ from sacremoses.tokenize import MosesTokenizer, MosesDetokenizer
 
 
 class TestTokenzier(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Tokenizer construction compiles the regexes, so share them across tests.
+        cls.en = MosesTokenizer()
+
     def test_moses_tokenize(self):
-        moses = MosesTokenizer()
+        moses = self.en
 
         # Tokenize a sentence.
-        text = (
-            u"This, is a sentence with weird\xbb symbols\u2026 appearing everywhere\xbf"
-        )
-        expected_tokens = u"This , is a sentence with weird \xbb symbols \u2026 appearing everywhere \xbf"
-        tokenized_text = moses.tokenize(text, return_str=True)
-        assert tokenized_text == expected_tokens
+        with self.subTest(case="weird symbols"):
+            text = (
+                u"This, is a sentence with weird\xbb symbols\u2026 appearing everywhere\xbf"
+            )
+            expected_tokens = u"This , is a sentence with weird \xbb symbols \u2026 appearing everywhere \xbf"
+            tokenized_text = moses.tokenize(text, return_str=True)
+            self.assertEqual(tokenized_text, expected_tokens)
 
         # The nonbreaking prefixes should tokenize the final fullstop.
-        assert moses.tokenize("abc def.") == [u"abc", u"def", u"."]
+        with self.subTest(case="final fullstop"):
+            self.assertEqual(moses.tokenize("abc def."), [u"abc", u"def", u"."])
 
         # The nonbreaking prefixes should deal the situation when numeric only prefix is the last token.
         # In below example, "pp" is the last element, and there is no digit after it.
-        assert moses.tokenize("2016, pp.") == [u"2016", u",", u"pp", u"."]
+        with self.subTest(case="numeric only prefix"):
+            self.assertEqual(moses.tokenize("2016, pp."), [u"2016", u",", u"pp", u"."])
 
         # Test escape_xml
         text = "This ain't funny. It's actually hillarious, yet double Ls. | [] < > [ ] & You're gonna shake it off? Don't?"
@@ -98,16 +106,19 @@ class TestTokenzier(unittest.TestCase):
             "'t",
             "?",
         ]
-        assert moses.tokenize(text, escape=True) == expected_tokens_with_xmlescape
-        assert moses.tokenize(text, escape=False) == expected_tokens_wo_xmlescape
+        with self.subTest(case="escape"):
+            self.assertEqual(moses.tokenize(text, escape=True), expected_tokens_with_xmlescape)
+        with self.subTest(case="no escape"):
+            self.assertEqual(moses.tokenize(text, escape=False), expected_tokens_wo_xmlescape)
 
         # Test to check https://github.com/alvations/sacremoses/issues/19
-        text = "this 'is' the thing"
-        expected_tokens = ["this", "&apos;", "is", "&apos;", "the", "thing"]
-        assert moses.tokenize(text, escape=True) == expected_tokens
+        with self.subTest(case="quoted word"):
+            text = "this 'is' the thing"
+            expected_tokens = ["this", "&apos;", "is", "&apos;", "the", "thing"]
+            self.assertEqual(moses.tokenize(text, escape=True), expected_tokens)
 
     def test_aggressive_split(self):
-        moses = MosesTokenizer()
+        moses = self.en
         expected_tokens_wo_aggressive_dash_split = ["foo-bar"]
         expected_tokens_with_aggressive_dash_split = ["foo", "@-@", "bar"]
 
@@ -118,7 +129,7 @@ class TestTokenzier(unittest.TestCase):
         )
 
     def test_opening_brackets(self):
-        moses = MosesTokenizer()
+        moses = self.en
 
         text = "By the mid 1990s a version of the game became a Latvian television series (with a parliamentary setting, and played by Latvian celebrities)."
 
@@ -128,7 +139,7 @@ class TestTokenzier(unittest.TestCase):
         assert moses.tokenize(text) == expected_tokens
 
     def test_dot_splitting(self):
-        moses = MosesTokenizer()
+        moses = self.en
         text = "The meeting will take place at 11:00 a.m. Tuesday."
         expected_tokens = (
             "The meeting will take place at 11 : 00 a.m. Tuesday .".split()
@@ -136,7 +147,7 @@ class TestTokenzier(unittest.TestCase):
         self.assertEqual(moses.tokenize(text), expected_tokens)
 
     def test_trailing_dot_apostrophe(self):
-        moses = MosesTokenizer()
+        moses = self.en
         text = "'Hello.'"
         expected_tokens = "&apos;Hello . &apos;".split()
         self.assertEqual(moses.tokenize(text), expected_tokens)
@@ -168,7 +179,7 @@ class TestTokenzier(unittest.TestCase):
         # TODO: Make sure that non-breaking words remain non breaking.
 
     def test_protect_patterns(self):
-        moses = MosesTokenizer()
+        moses = self.en
         text = "this is a webpage https://stackoverflow.com/questions/6181381/how-to-print-variables-in-perl that kicks ass"
         expected_tokens = [
             "this",
@@ -196,7 +207,7 @@ class TestTokenzier(unittest.TestCase):
         assert moses.tokenize(text, protected_patterns=noe_patterns) == expected_tokens
 
     def test_final_comma_split_after_number(self):
-        moses = MosesTokenizer()
+        moses = self.en
         text = u"Sie sollten vor dem Upgrade eine Sicherung dieser Daten erstellen (wie unter Abschnitt 4.1.1, âSichern aller Daten und Konfigurationsinformationenâ beschrieben). "
         expected_tokens = [
             "Sie",
@@ -230,9 +241,21 @@ class TestTokenzier(unittest.TestCase):
 
 
 class TestDetokenizer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Tokenizer construction compiles the regexes, so share them across tests.
+        cls.en = MosesTokenizer()
+        cls.fr = MosesTokenizer(lang="fr")
+        cls.zh = MosesTokenizer(lang="zh")
+        cls.ko = MosesTokenizer(lang="ko")
+        cls.ja = MosesTokenizer(lang="ja")
+        cls.md_en = MosesDetokenizer()
+        cls.md_fr = MosesDetokenizer(lang="fr")
+        cls.md_ko = MosesDetokenizer(lang="ko")
+
     def test_moses_detokenize(self):
-        mt = MosesTokenizer()
-        md = MosesDetokenizer()
+        mt = self.en
+        md = self.md_en
 
         text = (
             u"This, is a sentence with weird\xbb symbols\u2026 appearing everywhere\xbf"
@@ -282,46 +305,46 @@ class TestDetokenizer(unittest.TestCase):
         assert md.detokenize(expected_tokens) == expected_detokens
 
     def test_detokenize_with_aggressive_split(self):
-        mt = MosesTokenizer()
-        md = MosesDetokenizer()
+        mt = self.en
+        md = self.md_en
 
         text = "foo-bar"
         assert md.detokenize(mt.tokenize(text, aggressive_dash_splits=True)) == text
 
     def test_opening_brackets(self):
-        tokenizer = MosesTokenizer()
-        detokenizer = MosesDetokenizer()
+        tokenizer = self.en
+        detokenizer = self.md_en
 
         text = "By the mid 1990s a version of the game became a Latvian television series (with a parliamentary setting, and played by Latvian celebrities)."
         assert detokenizer.detokenize(tokenizer.tokenize(text)) == text
 
     def test_french_apostrophes(self):
-        tokenizer = MosesTokenizer(lang="fr")
-        detokenizer = MosesDetokenizer(lang="fr")
+        tokenizer = self.fr
+        detokenizer = self.md_fr
 
         text = u"L'amitiÃ© nous a fait forts d'esprit"
         assert detokenizer.detokenize(tokenizer.tokenize(text)) == text
 
     def test_chinese_tokenization(self):
-        tokenizer = MosesTokenizer(lang="zh")
+        tokenizer = self.zh
         text = u"è®°è åºè°¦ ç¾å½"
         assert tokenizer.tokenize(text) == [u'è®°è', u'åºè°¦', u'ç¾å½']
 
     def test_korean_tokenization(self):
-        tokenizer = MosesTokenizer(lang="ko")
-        detokenizer = MosesDetokenizer(lang="ko")
+        tokenizer = self.ko
+        detokenizer = self.md_ko
         text = u"ì¸ê³ ìì ê°ì¥ ê°ë ¥í."
         assert tokenizer.tokenize(text) == [u'ì¸ê³', u'ìì', u'ê°ì¥', u'ê°ë ¥í', u'.']
         assert detokenizer.detokenize(tokenizer.tokenize(text)) == text
 
     def test_japanese_tokenization(self):
-        tokenizer = MosesTokenizer(lang="ja")
+        tokenizer = self.ja
         text = u"é»è©±ã§ããã®éªé­ããã¾ãããªãã§ãã ãã"
         assert tokenizer.tokenize(text) == [text]
 
     def test_mixed_cjk_tokenization(self):
-        tokenizer = MosesTokenizer()
-        detokenizer = MosesDetokenizer()
+        tokenizer = self.en
+        detokenizer = self.md_en
         text = u"Japan is æ¥æ¬ in Japanese."
         assert tokenizer.tokenize(text) == [
             u"Japan",
@@ -3,7 +3,7 @@
 
 import re
 
-from six import text_type
+from six import text_type, unichr
 
 from sacremoses.corpus import Perluniprops
 from sacremoses.corpus import NonbreakingPrefixes
@@ -39,6 +39,14 @@ class MosesTokenizer(object):
 
     # Pad all "other" special characters not in IsAlnum.
     PAD_NOT_ISALNUM = u"([^{}\s\.'\`\,\-])".format(IsAlnum), r" \1 "
+    # The ASCII characters padded by PAD_NOT_ISALNUM, as a str.translate
+    # table so that ASCII-only text can skip the regex.
+    PAD_NOT_ISALNUM_ASCII = {
+        ord(char): u" {} ".format(char)
+        for char in re.findall(PAD_NOT_ISALNUM[0], u"".join(map(unichr, range(128))))
+    }
+    # Matches any non-ASCII character, i.e. text that needs PAD_NOT_ISALNUM.
+    NON_ASCII = re.compile(r"[^\x00-\x7f]")
 
     # Splits all hyphens (regardless of circumstances), e.g.
     # 'foo-bar' -> 'foo @-@ bar'
@@ -469,8 +477,11 @@ class MosesTokenizer(object):
         else:
         '''
         # Separate special characters outside of IsAlnum character set.
-        regexp, substitution = self.PAD_NOT_ISALNUM
-        text = re.sub(regexp, substitution, text)
+        if self.NON_ASCII.search(text):
+            regexp, substitution = self.PAD_NOT_ISALNUM
+            text = re.sub(regexp, substitution, text)
+        else:
+            text = text.translate(self.PAD_NOT_ISALNUM_ASCII)
         # Aggressively splits dashes
         if aggressive_dash_splits:
             regexp, substitution = self.AGGRESSIVE_HYPHEN_SPLIT
@@ -20,15 +20,14 @@ from __future__ import unicode_literals
 
 import time
 import os
-from time import sleep
-from multiprocessing import Queue
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import click
 import cv2
 import numpy as np
 
 from lmnet.nnlib import NNLib
-from multiprocessing import Pool
 from lmnet.utils.config import (
     load_yaml,
     build_pre_process,
@@ -39,18 +38,31 @@ from lmnet.utils.demo import (
     add_fps,
 )
 
-nn = None
-pre_process = None
-post_process = None
+enable_profile = False
+# Profile output of the current loop, written out at once by flush_profile().
+profile_lines = []
 
 
 class MyTime:
+    """Measure and print elapsed time, only when the demo runs with --profile."""
+
     def __init__(self, function_name):
-        self.start_time = time.time()
         self.function_name = function_name
+        if enable_profile:
+            self.start_time = time.perf_counter()
 
     def show(self):
-        print("TIME: ", self.function_name, time.time() - self.start_time)
+        if enable_profile:
+            profile_lines.append("TIME:  {} {}\n".format(self.function_name, time.perf_counter() - self.start_time))
+
+
+def flush_profile():
+    """Write the profile output of one loop to stdout in a single write."""
+    # The inference thread may append while we write, so only remove what was written.
+    lines = profile_lines[:]
+    if lines:
+        sys.stdout.write("".join(lines))
+        del profile_lines[:len(lines)]
 
 
 def init_camera(camera_width, camera_height):
@@ -65,6 +77,9 @@ def init_camera(camera_width, camera_height):
         vc.set(cv2.CAP_PROP_FRAME_WIDTH, camera_width)
         vc.set(cv2.CAP_PROP_FRAME_HEIGHT, camera_height)
         vc.set(cv2.CAP_PROP_FPS, 10)
+        # Keep only the newest frame in the driver so vc.read() doesn't return stale frames.
+        if not vc.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+            print("WARNING: could not set the camera buffer size, frames may lag behind.")
 
     return vc
 
@@ -79,38 +94,65 @@ def add_class_label(canvas,
     cv2.putText(canvas, text, dl_corner, font, font_scale, font_color, line_type)
 
 
-def run_inference(img):
-    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    global nn, pre_process, post_process
-    start = time.time()
-
-    data = pre_process(image=img)["image"]
-    data = np.asarray(data, dtype=np.float32)
-    data = np.expand_dims(data, axis=0)
-
-    start_time = time.time()
-    result = nn.run(data)
-
-    inference_time = time.time() - start_time
-    result = post_process(outputs=result)['outputs']
-    print('inference time: {:.3f}s'.format(inference_time))
-
-    fps = 1.0/(time.time() - start)
-    return result, fps
+def make_class_overlay(classes, result, fps, window_shape):
+    """Draw the class labels and fps on a blank overlay.
+
+    The overlay only changes with the inference result, so it is drawn once per
+    result and copied onto each displayed frame through the returned mask.
+    """
+    overlay = np.zeros(window_shape + (3,), dtype=np.uint8)
+    result_class = np.argmax(result, axis=1)
+    add_class_label(overlay, text=str(result[0, result_class][0]), font_scale=0.52, dl_corner=(230, 230))
+    add_class_label(overlay, text=classes[result_class[0]], font_scale=0.52, dl_corner=(230, 210))
+    overlay = add_fps(overlay, fps)
+    mask = overlay.any(axis=2, keepdims=True)
+    return overlay, mask
+
+
+def make_run_inference(nn, pre_process, post_process, input_channel_order):
+    """Return run_inference bound to the given network and processors.
+
+    Everything the inference needs is kept in the closure, so the per-frame
+    function doesn't look anything up in the module globals.
+    """
+    convert_to_rgb = input_channel_order == "RGB"
+    profile = enable_profile
+    input_buffer = None
+
+    def run_inference(img):
+        nonlocal input_buffer
+        # Models trained on BGR images take the camera frames as they are.
+        if convert_to_rgb:
+            img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        start = time.time()
+
+        # asarray makes no copy when the pre-processors return an ndarray.
+        data = np.asarray(pre_process(image=img)["image"])
+        # The pre-processors already return float32, so only cast when they don't.
+        # The cast writes into a buffer allocated once in the inference worker.
+        if data.dtype != np.float32:
+            if input_buffer is None or input_buffer.shape[1:] != data.shape:
+                input_buffer = np.empty((1,) + data.shape, dtype=np.float32)
+            np.copyto(input_buffer[0], data, casting="unsafe")
+            data = input_buffer
+        else:
+            data = data[np.newaxis]
 
+        start_time = time.time()
+        result = nn.run(data)
 
-def clear_queue(queue):
-    while not queue.empty():
-        queue.get()
-    return queue
+        inference_time = time.time() - start_time
+        result = post_process(outputs=result)['outputs']
+        if profile:
+            profile_lines.append('inference time: {:.3f}s\n'.format(inference_time))
 
+        fps = 1.0/(time.time() - start)
+        return result, fps
 
-def swap_queue(q1, q2):
-    return q2, q1  # These results are swapped
+    return run_inference
 
 
-def run_object_detection(config):
-    global nn
+def run_object_detection(config, run_inference, pool):
     # Set variables
     camera_width = 320
     camera_height = 240
@@ -120,59 +162,59 @@ def run_object_detection(config):
 
     vc = init_camera(camera_width, camera_height)
 
-    pool = Pool(processes=1, initializer=nn.init)
-    result = False
-    fps = 1.0
-
-    q_save = Queue()
-    q_show = Queue()
-
     grabbed, camera_img = vc.read()
 
-    q_show.put(camera_img.copy())
-    input_img = camera_img.copy()
+    # The first frame is only read by the inference thread and shown unchanged
+    # until its result is ready, so neither needs its own copy.
+    input_img = camera_img
+    window_img = camera_img
 
     #  ----------- Beginning of Main Loop ---------------
     while True:
         m1 = MyTime("1 loop of while(1) of main()")
-        pool_result = pool.apply_async(run_inference, (input_img, ))
-        is_first = True
-        while True:
-            grabbed, camera_img = vc.read()
-            if is_first:
-                input_img = camera_img.copy()
-                is_first = False
-            q_save.put(camera_img.copy())
-            if not q_show.empty():
-                window_img = q_show.get()
-                if result:
-                    window_img = add_rectangle(
-                        config.CLASSES,
-                        window_img,
-                        result,
-                        (input_height, input_width)
-                    )
-                    window_img = add_fps(window_img, fps)
-                # ---------- END of if result != False -----------------
-
-                cv2.imshow(window_name, window_img)
-                key = cv2.waitKey(2)    # Wait for 2ms
-                if key == 27:           # ESC to quit
-                    return
-            if pool_result.ready():
-                break
+        pool_result = pool.submit(run_inference, input_img)
+        # The window only changes with a new result, so show it once per result.
+        cv2.imshow(window_name, window_img)
+        key = cv2.waitKey(1)    # Wait for 1ms
+        if key == 27:           # ESC to quit
+            return
+
+        grabbed = False
+        while not pool_result.done():
+            # Only grab to drain the camera, the frames are decoded once inference is done.
+            # vc.grab() blocks until the next frame, so this runs once per camera frame.
+            grabbed = vc.grab()
+
+            key = cv2.waitKey(1)    # Wait for 1ms
+            if key == 27:           # ESC to quit
+                return
 
         # -------------- END of wait loop ----------------------
-        q_show = clear_queue(q_show)
-        q_save, q_show = swap_queue(q_save, q_show)
-        result, fps = pool_result.get()
+        if grabbed:
+            grabbed, camera_img = vc.retrieve()
+        else:
+            grabbed, camera_img = vc.read()
+        result, fps = pool_result.result()
+        window_img = input_img
+        if result:
+            window_img = add_rectangle(
+                config.CLASSES,
+                window_img,
+                result,
+                (input_height, input_width)
+            )
+            window_img = add_fps(window_img, fps)
+        # ---------- END of if result != False -----------------
+
+        # vc.read() allocates a new array for every frame, so no copy is needed.
+        input_img = camera_img
         m1.show()
+        flush_profile()
 
     # --------------------- End of main Loop -----------------------
 
 
-def run_classification(config):
-    global nn
+def run_classification(config, run_inference, pool):
     camera_height = 240
     camera_width = 320
 
@@ -182,19 +224,18 @@ def run_classification(config):
 
     vc = init_camera(camera_width, camera_height)
 
-    pool = Pool(processes=1, initializer=nn.init)
-
     grabbed, camera_img = vc.read()
 
-    pool_result = pool.apply_async(run_inference, (camera_img, ))
+    pool_result = pool.submit(run_inference, camera_img)
     result = None
     fps = 1.0
+    overlay_dirty = False
     loop_count = 0
 
     while 1:
 
         m1 = MyTime("1 loop of while(1) of main()")
-        key = cv2.waitKey(2)    # Wait for 2ms
+        key = cv2.waitKey(1)    # Wait for 1ms
         if key == 27:           # ESC to quit
             break
 
@@ -202,9 +243,11 @@ def run_classification(config):
         grabbed, camera_img = vc.read()
         m2.show()
 
-        if pool_result.ready():
-            result, fps = pool_result.get()
-            pool_result = pool.apply_async(run_inference, (camera_img, ))
+        if pool_result.done():
+            result, fps = pool_result.result()
+            # camera_img is drawn on below while the inference thread still reads it.
+            pool_result = pool.submit(run_inference, camera_img.copy())
+            overlay_dirty = True
 
         if (window_width == camera_width) and (window_height == camera_height):
             window_img = camera_img
@@ -212,28 +255,31 @@ def run_classification(config):
             window_img = cv2.resize(camera_img, (window_width, window_height))
 
         if result is not None:
-            result_class = np.argmax(result, axis=1)
-            add_class_label(window_img, text=str(result[0, result_class][0]), font_scale=0.52, dl_corner=(230, 230))
-            add_class_label(window_img, text=config.CLASSES[result_class[0]], font_scale=0.52, dl_corner=(230, 210))
-            window_img = add_fps(window_img, fps)
+            if overlay_dirty:
+                overlay, overlay_mask = make_class_overlay(config.CLASSES, result, fps, window_img.shape[:2])
+                overlay_dirty = False
+            np.copyto(window_img, overlay, where=overlay_mask)
             loop_count += 1
-            print("loop_count:", loop_count)
+            if enable_profile:
+                profile_lines.append("loop_count: {}\n".format(loop_count))
 
         m3 = MyTime("cv2.imshow()")
         cv2.imshow(window_name, window_img)
         m3.show()
 
+        # No sleep here, vc.read() already paces the loop at the camera frame rate.
         m1.show()
-        sleep(0.05)
+        flush_profile()
 
     cv2.destroyAllWindows()
 
 
-def run(model, config_file):
-    global nn, pre_process, post_process
+def run(model, config_file, profile=False):
+    global enable_profile
+    enable_profile = profile
     filename, file_extension = os.path.splitext(model)
 
-    if not file_extension == '.so' or not file_extension == '.pb':
+    if file_extension not in ('.so', '.pb'):
         raise Exception("""
             Unknown file type. Got %s%s.
             Please check the model file (-m). We only support .pb and .so files.
@@ -242,6 +288,7 @@ def run(model, config_file):
     config = load_yaml(config_file)
     pre_process = build_pre_process(config.PRE_PROCESSOR)
     post_process = build_post_process(config.POST_PROCESSOR)
+    input_channel_order = getattr(config, "INPUT_CHANNEL_ORDER", "RGB")
 
     if file_extension == '.so':  # Shared library
         nn = NNLib()
@@ -255,11 +302,21 @@ def run(model, config_file):
     else:
         raise Exception("Unknown file type. Got %s." % (filename))
 
-    if config.TASK == "IMAGE.CLASSIFICATION":
-        run_classification(config)
+    # Inference and display already run on their own threads, OpenCV's internal
+    # thread pool would only compete with them for the cores on these small frames.
+    cv2.setNumThreads(1)
+
+    nn.init()
+    run_inference = make_run_inference(nn, pre_process, post_process, input_channel_order)
 
-    if config.TASK == "IMAGE.OBJECT_DETECTION":
-        run_object_detection(config)
+    # nn.run releases the GIL, so a thread overlaps inference with capture
+    # without pickling every frame to a worker process.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        if config.TASK == "IMAGE.CLASSIFICATION":
+            run_classification(config, run_inference, pool)
+
+        if config.TASK == "IMAGE.OBJECT_DETECTION":
+            run_object_detection(config, run_inference, pool)
 
 
 @click.command(context_settings=dict(help_option_names=['-h', '--help']))
@@ -277,8 +334,13 @@ def run(model, config_file):
     help=u"Config file Path",
     default="../models/meta.yaml",
 )
-def main(model, config_file):
-    run(model, config_file)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help=u"Print the time spent in each step of the main loop",
+)
+def main(model, config_file, profile):
+    run(model, config_file, profile)
 
 
 if __name__ == "__main__":
@@ -72,25 +72,36 @@ def add_rectangle(classes, orig, preds, pred_shape):
     w_scale = orig_w / pred_w
     h_scale = orig_h / pred_h
     locs = (np.array(locs).reshape((-1, 4)) * [w_scale, h_scale, w_scale, h_scale]).astype(int)
-    for idx, loc in enumerate(locs):
-        t, b, le, r = ltwh_to__tblr(loc)
 
-        le = check_range(orig_w, 0, le)
-        r = check_range(orig_w, 0, r)
-        t = check_range(orig_h, 0, t)
-        b = check_range(orig_h, 0, b)
-
-        color_r = COLORS[labels_n[idx] % len(COLORS)]
-        thick = 2
+    # Convert all the boxes from ltwh to clipped corners at once.
+    lefts = np.clip(locs[:, 0], 0, orig_w)
+    tops = np.clip(locs[:, 1], 0, orig_h)
+    rights = np.clip(locs[:, 0] + locs[:, 2], 0, orig_w)
+    bottoms = np.clip(locs[:, 1] + locs[:, 3], 0, orig_h)
+    corners = np.stack([
+        np.stack([lefts, tops], axis=1),
+        np.stack([rights, tops], axis=1),
+        np.stack([rights, bottoms], axis=1),
+        np.stack([lefts, bottoms], axis=1),
+    ], axis=1).astype(np.int32)
+
+    # Draw the boxes with one polylines call per color.
+    color_ids = labels_n % len(COLORS)
+    thick = 2
+    for color_id in np.unique(color_ids):
+        cv2.polylines(orig, list(corners[color_ids == color_id]), True, COLORS[color_id], thick)
+
+    cv2_filed_config = cv2.cv.CV_FILLED if hasattr(cv2, 'cv') else cv2.FILLED
+
+    for idx in range(len(locs)):
+        le, t = int(lefts[idx]), int(tops[idx])
+        color_r = COLORS[color_ids[idx]]
         label_text = "{} : {:.1f}%".format(labels[idx], scores[idx] * 100)
         label_size, baseline = cv2.getTextSize(label_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
-        cv2.rectangle(orig, (le, t), (r, b), color_r, thick)
 
         max_color = max(color_r)
         text_color = (255, 255, 255) if max_color < 255 else (0, 0, 0)
 
-        cv2_filed_config = cv2.cv.CV_FILLED if hasattr(cv2, 'cv') else cv2.FILLED
-
         cv2.rectangle(orig, (le, t), (le + label_size[0], t + label_size[1]), color_r, cv2_filed_config)
         cv2.putText(orig, label_text, (le, t + label_size[1]), cv2.FONT_HERSHEY_SIMPLEX, 0.5, text_color)
 
@@ -1,22 +1,38 @@
+import io
+import mmap
 import struct
+import warnings
 from collections import namedtuple
+from contextlib import contextmanager
 from collections.abc import Iterable
-from crc32c import crc32 as crc32c
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import BinaryIO, Union, Optional
+from typing import BinaryIO, List, Union, Optional
 
 import cv2
 import numpy as np
 from tensorboard.compat.proto.event_pb2 import Event
+from google.protobuf.internal import api_implementation
 
+# events are decoded one by one, which is several times slower
+# with the pure Python protobuf implementation
+if api_implementation.Type() == 'python':
+    warnings.warn(
+        'The pure Python protobuf implementation is used, '
+        'reading of Tensorboard events files will be slow. '
+        'Install a protobuf package with the C extension to speed it up.'
+    )
 
-def _u32(x):
-    return x & 0xffffffff
+# google-crc32c uses the hardware CRC32C instructions when available
+try:
+    from google_crc32c import value as crc32c
+except ImportError:
+    from crc32c import crc32 as crc32c
 
 
 def _masked_crc32c(data):
-    x = _u32(crc32c(data))
-    return _u32(((x >> 15) | _u32(x << 17)) + 0xa282ead8)
+    x = crc32c(data)
+    return (((x >> 15) | (x << 17)) + 0xa282ead8) & 0xffffffff
 
 
 class EventReadingError(Exception):
@@ -61,20 +77,15 @@ class EventsFileReader(Iterable):
             return None
         return data
 
-    def _read_and_check(self, size: int) -> Optional[bytes]:
+    @staticmethod
+    def _check(data: bytes, checksum: int) -> None:
         """
-        Read and check data described by a format string.
+        Check data against its masked CRC32C checksum.
 
-        :param size: A size in bytes to be read.
-        :return: A decoded number.
-        :except: NotImplementedError if the stream is in non-blocking mode.
-        :except: EventReadingError on reading error.
+        :param data: A `bytes` object with data to be checked.
+        :param checksum: An expected checksum of the data.
+        :except: EventReadingError on checksum mismatch.
         """
-        data = self._read(size)
-        if data is None:
-            return None
-        checksum_size = struct.calcsize('I')
-        checksum = struct.unpack('I', self._read(checksum_size))[0]
         checksum_computed = _masked_crc32c(data)
         if checksum != checksum_computed:
             raise EventReadingError(
@@ -82,7 +93,6 @@ class EventsFileReader(Iterable):
                     checksum=checksum, crc32=checksum_computed
                 )
             )
-        return data
 
     def __iter__(self) -> Event:
         """
@@ -92,15 +102,21 @@ class EventsFileReader(Iterable):
         :except: NotImplementedError if the stream is in non-blocking mode.
         :except: EventReadingError on reading error.
         """
+        # every field is followed by its checksum,
+        # so both are read with a single call
+        header_size = struct.calcsize('Q')
+        checksum_size = struct.calcsize('I')
         while True:
-            header_size = struct.calcsize('Q')
-            header = self._read_and_check(header_size)
+            header = self._read(header_size + checksum_size)
             if header is None:
                 break
-            event_size = struct.unpack('Q', header)[0]
-            event_raw = self._read_and_check(event_size)
-            if event_raw is None:
+            event_size, header_checksum = struct.unpack('QI', header)
+            self._check(header[:header_size], header_checksum)
+            data = self._read(event_size + checksum_size)
+            if data is None:
                 raise EventReadingError('Unexpected end of events file')
+            event_raw = data[:event_size]
+            self._check(event_raw, struct.unpack('I', data[event_size:])[0])
             event = Event()
             event.ParseFromString(event_raw)
             yield event
@@ -118,7 +134,8 @@ class SummaryReader(Iterable):
     def __init__(
         self, logdir: Union[str, Path],
         tag_filter: Optional[Iterable] = None,
-        type_filter: Optional[Iterable] = None
+        type_filter: Optional[Iterable] = None,
+        num_workers: int = 1
     ):
         """
         Initalize new summary reader
@@ -126,10 +143,13 @@ class SummaryReader(Iterable):
         :param tag_filter: A list of tags to leave (`None` for all)
         :param type_filter: A list of types to leave (`None` for all)
             Note that only 'scalar' and 'image' types are allowed at the moment.
+        :param num_workers: A number of processes to read files in parallel
+            (`1` to read them in the current process)
         """
         self._logdir = Path(logdir)
         self._tag_filter = set(tag_filter) if tag_filter is not None else None
         self._type_filter = set(type_filter) if type_filter is not None else None
+        self._num_workers = num_workers
 
     @staticmethod
     def _decode_image(encoded_image) -> np.ndarray:
@@ -171,6 +191,25 @@ class SummaryReader(Iterable):
                     value=data, type=event_type
                 )
 
+    @staticmethod
+    @contextmanager
+    def _map_file(f: BinaryIO) -> BinaryIO:
+        """
+        Memory-map an opened events file for sequential reading
+        :param f: An opened file-like object
+        :return: A memory-mapped file or `f` itself if it can't be mapped
+        """
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (io.UnsupportedOperation, ValueError):
+            # empty files and streams without a file descriptor
+            yield f
+            return
+        with mm:
+            if hasattr(mm, 'madvise'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield mm
+
     def _check_tag(self, tag: str) -> bool:
         """
         Check if a tag matches the current tag filter
@@ -187,18 +226,41 @@ class SummaryReader(Iterable):
         """
         return self._type_filter is None or event_type in self._type_filter
 
+    def _read_file(self, file_path: Path) -> SummaryItem:
+        """
+        Iterate over filtered events in a single events file
+        :param file_path: A path to the events file
+        :return: A generator with `SummaryItem` objects
+        """
+        with open(file_path, 'rb') as f, self._map_file(f) as events_file:
+            reader = EventsFileReader(events_file)
+            yield from (
+                item for item in self._decode_events(reader)
+                if item is not None
+                   and self._check_tag(item.tag)
+                   and self._check_type(item.type)
+            )
+
+    def _read_file_items(self, file_path: Path) -> List[SummaryItem]:
+        """
+        Read filtered events of a single events file in a worker process
+        :param file_path: A path to the events file
+        :return: A list with `SummaryItem` objects
+        """
+        return list(self._read_file(file_path))
+
     def __iter__(self) -> SummaryItem:
         """
         Iterate over events in all the files in the current logdir
         :return: A generator with `SummaryItem` objects
         """
         log_files = sorted(f for f in self._logdir.glob('*') if f.is_file())
-        for file_path in log_files:
-            with open(file_path, 'rb') as f:
-                reader = EventsFileReader(f)
-                yield from (
-                    item for item in self._decode_events(reader)
-                    if item is not None
-                       and self._check_tag(item.tag)
-                       and self._check_type(item.type)
-                )
+        if self._num_workers > 1 and len(log_files) > 1:
+            # events are filtered in the workers to keep the results small,
+            # files are yielded in the same order as in the serial mode
+            with ProcessPoolExecutor(self._num_workers) as executor:
+                for items in executor.map(self._read_file_items, log_files):
+                    yield from items
+        else:
+            for file_path in log_files:
+                yield from self._read_file(file_path)
@@ -193,3 +193,19 @@ def test_summary_reader_filter_scalars():
         assert item.tag == event_raw['tag']
         assert item.type == 'scalar'
         assert np.all(item.value == event_raw['value'])
+
+
+def test_summary_reader_parallel(tmpdir):
+    data, _ = _get_test_data()
+    for name in ['1', '2', '3']:
+        tmpdir.join(name).write_binary(data)
+    items = list(SummaryReader(str(tmpdir)))
+    items_parallel = list(SummaryReader(str(tmpdir), num_workers=2))
+
+    assert len(items_parallel) == len(items)
+
+    for item, item_parallel in zip(items, items_parallel):
+        assert item_parallel.step == item.step
+        assert item_parallel.tag == item.tag
+        assert item_parallel.type == item.type
+        assert np.all(item_parallel.value == item.value)
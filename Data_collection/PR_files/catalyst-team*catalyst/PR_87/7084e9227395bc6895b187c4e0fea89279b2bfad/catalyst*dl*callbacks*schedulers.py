@@ -1,5 +1,7 @@
 from typing import Tuple
 
+import numpy as np
+
 from .core import Callback
 from catalyst.dl.callbacks.utils import get_optimizer_momentum
 
@@ -13,6 +15,8 @@ class LRUpdater(Callback):
             for learning rate scheduling
         """
         self.init_lr = 0
+        # whether the optimizer keeps momentum in Adam-style betas
+        self.use_betas = False
         self.optimizer_key = optimizer_key
 
     def calc_lr(self):
@@ -21,29 +25,25 @@ class LRUpdater(Callback):
     def calc_momentum(self):
         return None
 
-    @staticmethod
-    def _update_lr(optimizer, new_lr):
+    def _update_param_groups(self, optimizer, new_lr, new_momentum):
         for pg in optimizer.param_groups:
-            pg["lr"] = new_lr
-
-    @staticmethod
-    def _update_momentum(optimizer, new_momentum):
-        if "betas" in optimizer.param_groups[0]:
-            for pg in optimizer.param_groups:
+            if new_lr is not None:
+                pg["lr"] = new_lr
+            if new_momentum is None:
+                continue
+            if self.use_betas:
                 pg["betas"] = (new_momentum, pg["betas"][1])
-        else:
-            for pg in optimizer.param_groups:
+            else:
                 pg["momentum"] = new_momentum
 
     def _update_optimizer(self, optimizer):
         new_lr = self.calc_lr()
-        if new_lr is not None:
-            self._update_lr(optimizer, new_lr)
-
         new_momentum = self.calc_momentum()
-        if new_momentum is not None:
-            self._update_momentum(optimizer, new_momentum)
-        else:
+        # update lr and momentum in a single pass over param groups
+        if new_lr is not None or new_momentum is not None:
+            self._update_param_groups(optimizer, new_lr, new_momentum)
+
+        if new_momentum is None:
             new_momentum = get_optimizer_momentum(optimizer)
 
         return new_lr, new_momentum
@@ -64,6 +64,7 @@ class LRUpdater(Callback):
             key="optimizer", inner_key=self.optimizer_key
         )
         self.init_lr = optimizer.defaults["lr"]
+        self.use_betas = "betas" in optimizer.param_groups[0]
 
     def on_loader_start(self, state):
         self.update_optimizer(state=state)
@@ -108,16 +109,31 @@ class OneCycleLR(LRUpdater):
         # point in iterations for starting lr decreasing
         self.cut_point = None
         self.momentum_range = momentum_range
+        # lr and momentum values for every iteration of the cycle
+        self.lr_schedule = None
+        self.momentum_schedule = None
 
-    def calc_lr(self):
+    def _calc_schedules(self):
+        iters = np.arange(self.total_iter)
         # calculate percent for learning rate change
-        if self.cycle_iter > self.cut_point:
-            percent_curr = (self.cycle_iter - self.cut_point)
-            percent_all = (self.total_iter - self.cut_point)
-            percent = (1 - percent_curr / percent_all)
-        else:
-            percent = self.cycle_iter / self.cut_point
-        res = self.init_lr * (1 + percent * (self.div - 1)) / self.div
+        percent = np.empty(self.total_iter)
+        cut = self.cut_point + 1
+        percent[:cut] = iters[:cut] / self.cut_point
+        percent[cut:] = (
+            1 - (iters[cut:] - self.cut_point) /
+            (self.total_iter - self.cut_point)
+        )
+        self.lr_schedule = (
+            self.init_lr * (1 + percent * (self.div - 1)) / self.div
+        )
+        # momentum changes in the opposite direction
+        self.momentum_schedule = (
+            self.momentum_range[1] +
+            (1 - percent) * (self.momentum_range[0] - self.momentum_range[1])
+        )
+
+    def calc_lr(self):
+        res = self.lr_schedule[self.cycle_iter]
 
         self.cycle_iter += 1
         if self.cycle_iter == self.total_iter:
@@ -126,22 +142,13 @@ class OneCycleLR(LRUpdater):
         return res
 
     def calc_momentum(self):
-        if self.cycle_iter > self.cut_point:
-            now_ = (self.cycle_iter - self.cut_point)
-            all_ = (self.total_iter - self.cut_point)
-            percent = now_ / all_
-        else:
-            percent = 1 - self.cycle_iter / self.cut_point
-        res = (
-            self.momentum_range[1] +
-            percent * (self.momentum_range[0] - self.momentum_range[1])
-        )
-        return res
+        return self.momentum_schedule[self.cycle_iter]
 
     def on_loader_start(self, state):
         if state.is_train:
             self.total_iter = state.loader_len * self.cycle_len
             self.cut_point = self.total_iter // self.cut_div
+            self._calc_schedules()
 
         super().on_loader_start(state=state)
 
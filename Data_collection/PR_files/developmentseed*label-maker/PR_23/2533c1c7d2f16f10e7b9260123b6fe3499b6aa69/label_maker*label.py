@@ -3,26 +3,35 @@
 
 from os import makedirs, path as op
 from subprocess import run, Popen, PIPE
+from multiprocessing import Pool
 import json
+import random
 from functools import partial
 
 import numpy as np
 import mapbox_vector_tile
-import pyproj
 from shapely.geometry import shape
 from rasterio.features import rasterize
 from geojson import Feature, FeatureCollection as fc
 from mercantile import tiles, feature, Tile
 from PIL import Image, ImageDraw
-from tilepie import tilereduce
+from tilepie import uncompress
+from tilepie.reader import MBTilesReader, ExtractionError
 
 import label_maker
 from label_maker.utils import class_match
 from label_maker.filter import create_filter
 
 # declare a global accumulator so the workers will have access
+# labels are keyed by (x, y, z) tile tuples, formatted as x-y-z only for output
 tile_results = dict()
 
+# pixel coordinate of every 0-4096 vector tile coordinate
+tile_pixels = np.round(np.arange(4097) * 255. / 4096).astype(int)
+
+# mbtiles reader opened once by each tile worker process
+worker_tiles = None
+
 def make_labels(dest_folder, zoom, country, classes, ml_type, bounding_box, sparse, **kwargs):
     """Create label data from OSM QA tiles for specified classes
 
@@ -71,17 +80,19 @@ def make_labels(dest_folder, zoom, country, classes, ml_type, bounding_box, spar
              '-l', 'osm', '-f', '-z', str(zoom), '-Z', str(zoom), '-o',
              mbtiles_file_zoomed, filtered_geo])
 
-    # Call tilereduce
+    # Read and label the tiles in a pool of workers, each with its own mbtiles reader
     print('Determining labels for each tile')
     mbtiles_to_reduce = mbtiles_file_zoomed
-    tilereduce(dict(zoom=zoom, source=mbtiles_to_reduce, bbox=bounding_box,
-                    args=dict(ml_type=ml_type, classes=classes)),
-               _mapper, _callback, _done)
+    tiles_to_reduce = MBTilesReader(mbtiles_to_reduce).tileslist(bbox=bounding_box, zoomlevels=[zoom])
+    worker = partial(_tile_worker, args=dict(ml_type=ml_type, classes=classes))
+    with Pool(initializer=_init_tile_worker, initargs=(mbtiles_to_reduce,)) as pool:
+        for tile_label in pool.imap_unordered(worker, tiles_to_reduce, chunksize=64):
+            _callback(tile_label)
 
     # Add empty labels to any tiles which didn't have data
     empty_label = _create_empty_label(ml_type, classes)
     for tile in tiles(*bounding_box, [zoom]):
-        index = '-'.join([str(i) for i in tile])
+        index = tuple(tile)
         global tile_results
         if tile_results.get(index) is None:
             tile_results[index] = empty_label
@@ -101,7 +112,8 @@ def make_labels(dest_folder, zoom, country, classes, ml_type, bounding_box, spar
         # TODO: Add ability to set proportion of negative examples here
         n_neg_ex = int(1. * len(pos_examples))
         # Choose random subset of negative examples
-        neg_examples = np.random.choice(neg_examples, n_neg_ex, replace=False).tolist()
+        # random.sample only draws n_neg_ex items instead of permuting the whole list
+        neg_examples = random.sample(neg_examples, n_neg_ex)
 
         tile_results = {k: tile_results.get(k) for k in pos_examples + neg_examples}
         print('Using sparse mode; subselected {} background tiles'.format(n_neg_ex))
@@ -109,13 +121,13 @@ def make_labels(dest_folder, zoom, country, classes, ml_type, bounding_box, spar
     # write out labels as numpy arrays
     labels_file = op.join(dest_folder, 'labels.npz')
     print('Writing out labels to {}'.format(labels_file))
-    np.savez(labels_file, **tile_results)
+    np.savez(labels_file, **{_tile_index(tile): label for tile, label in tile_results.items()})
 
     # write out labels as GeoJSON or PNG
     if ml_type == 'classification':
         features = []
         for tile, label in tile_results.items():
-            feat = feature(Tile(*[int(t) for t in tile.split('-')]))
+            feat = feature(Tile(*tile))
             features.append(Feature(geometry=feat['geometry'],
                                     properties=dict(label=label.tolist())))
         json.dump(fc(features), open(op.join(dest_folder, 'classification.geojson'), 'w'))
@@ -126,7 +138,7 @@ def make_labels(dest_folder, zoom, country, classes, ml_type, bounding_box, spar
         for tile, label in tile_results.items():
             # if we have at least one bounding box label
             if bool(label.shape[0]):
-                label_file = '{}.png'.format(tile)
+                label_file = '{}.png'.format(_tile_index(tile))
                 img = Image.new('RGB', (256, 256))
                 draw = ImageDraw.Draw(img)
                 for box in label:
@@ -140,12 +152,31 @@ def make_labels(dest_folder, zoom, country, classes, ml_type, bounding_box, spar
         for tile, label in tile_results.items():
             # if we have any class pixels
             if np.sum(label):
-                label_file = '{}.png'.format(tile)
-                img = Image.fromarray(label * 255)
+                label_file = '{}.png'.format(_tile_index(tile))
+                # labels are uint8 class indices: widen before scaling so indices above 1 don't wrap
+                img = Image.fromarray(np.clip(label.astype(int) * 255, 0, 255).astype(np.uint8))
                 print('Writing {}'.format(label_file))
                 img.save(op.join(label_folder, label_file))
 
 
+def _tile_index(tile):
+    """Format an (x, y, z) tile tuple as an x-y-z tile index"""
+    return '{!s}-{!s}-{!s}'.format(*tile)
+
+def _init_tile_worker(mbtiles_file):
+    """Open the mbtiles file once in each worker process"""
+    global worker_tiles
+    worker_tiles = MBTilesReader(mbtiles_file)
+
+def _tile_worker(tile, args):
+    """Read a single (z, x, y) tile from the worker's mbtiles file and label it"""
+    z, x, y = tile
+    try:
+        data = uncompress(worker_tiles.tile(z, x, y))
+    except ExtractionError:
+        return None
+    return _mapper(x, y, z, data, args)
+
 def _mapper(x, y, z, data, args):
     """Iterate over OSM QA Tiles and return a label for each tile
 
@@ -168,7 +199,7 @@ def _mapper(x, y, z, data, args):
     Returns
     ---------
     label: tuple
-        The first element is a tile index of the form x-y-z. The second element is a list
+        The first element is a tile index of the form (x, y, z). The second element is a list
         representing the label of the tile
 
     """
@@ -176,47 +207,52 @@ def _mapper(x, y, z, data, args):
     classes = args.get('classes')
 
     if data is None:
-        return ('{!s}-{!s}-{!s}'.format(x, y, z), _create_empty_label(ml_type, classes))
+        return ((x, y, z), _create_empty_label(ml_type, classes))
 
     tile = mapbox_vector_tile.decode(data)
     # for each class, determine if any features in the tile match
 
     if tile['osm']['features']:
+        # build the class filters once rather than for every feature
+        class_filters = [create_filter(cl.get('filter')) for cl in classes]
         if ml_type == 'classification':
             class_counts = np.zeros(len(classes) + 1, dtype=np.int)
-            for i, cl in enumerate(classes):
-                ff = create_filter(cl.get('filter'))
-                class_counts[i + 1] = int(bool([f for f in tile['osm']['features'] if ff(f)]))
+            for i, ff in enumerate(class_filters):
+                class_counts[i + 1] = int(any(ff(f) for f in tile['osm']['features']))
             # if there are no classes, activate the background
             if np.sum(class_counts) == 0:
                 class_counts[0] = 1
-            return ('{!s}-{!s}-{!s}'.format(x, y, z), class_counts)
+            return ((x, y, z), class_counts)
         elif ml_type == 'object-detection':
-            bboxes = _create_empty_label(ml_type, classes)
+            bboxes = []
             for feat in tile['osm']['features']:
-                for i, cl in enumerate(classes):
-                    ff = create_filter(cl.get('filter'))
+                for i, ff in enumerate(class_filters):
                     if ff(feat):
                         geo = shape(feat['geometry'])
-                        bb = _pixel_bbox(geo.bounds) + [i + 1]
-                        bboxes = np.append(bboxes, np.array([bb]), axis=0)
-            return ('{!s}-{!s}-{!s}'.format(x, y, z), bboxes)
+                        bboxes.append(_pixel_bbox(geo.bounds) + [i + 1])
+            # build the label array once instead of growing it with np.append
+            if not bboxes:
+                return ((x, y, z), _create_empty_label(ml_type, classes))
+            return ((x, y, z), np.array(bboxes, dtype=int))
         elif ml_type == 'segmentation':
             geos = []
             for feat in tile['osm']['features']:
-                for i, cl in enumerate(classes):
-                    ff = create_filter(cl.get('filter'))
+                # later shapes overwrite earlier ones, so burn the last matching class
+                class_index = None
+                for i, ff in enumerate(class_filters):
                     if ff(feat):
-                        feat['geometry']['coordinates'] = _convert_coordinates(feat['geometry']['coordinates'])
-                        geos.append((feat['geometry'], i + 1))
-            result = rasterize(geos, out_shape=(256, 256))
-            return ('{!s}-{!s}-{!s}'.format(x, y, z), result)
-    return ('{!s}-{!s}-{!s}'.format(x, y, z), np.array())
+                        class_index = i + 1
+                if class_index is not None:
+                    feat['geometry']['coordinates'] = _convert_coordinates(feat['geometry']['coordinates'])
+                    geos.append((feat['geometry'], class_index))
+            result = rasterize(geos, out_shape=(256, 256), dtype=np.uint8)
+            return ((x, y, z), result)
+    return ((x, y, z), np.array())
 
 def _convert_coordinates(coords):
-    # for points, return the coordinates converted
-    if isinstance(coords[0], int):
-        return list(map(_pixel_bounds_convert, enumerate(coords)))
+    # for points and lists of points, convert all the coordinates at once
+    if isinstance(coords[0], int) or isinstance(coords[0][0], int):
+        return _pixel_coords_convert(coords).tolist()
     # for other geometries, recurse
     return list(map(_convert_coordinates, coords))
 
@@ -224,7 +260,7 @@ def _pixel_bbox(bb):
     """Convert a bounding box in 0-4096 to pixel coordinates"""
     # this will have coordinates in xmin, ymin, xmax, ymax order
     # because we flip the yaxis, we also need to reorder
-    converted = list(map(_pixel_bounds_convert, enumerate([bb[0], bb[3], bb[2], bb[1]])))
+    converted = _pixel_coords_convert([[bb[0], bb[3]], [bb[2], bb[1]]]).ravel().tolist()
     return _buffer_bbox(converted)
 
 def _buffer_bbox(bb, buffer=4):
@@ -236,14 +272,19 @@ def _buffer_bbox(bb, buffer=4):
         bb[3] + buffer
     ]
 
-def _pixel_bounds_convert(x):
-    """Convert a single 0-4096 coordinate to a pixel coordinate"""
-    (i, b) = x
+def _pixel_coords_convert(coords):
+    """Convert an array of 0-4096 (x, y) coordinates to pixel coordinates"""
     # input bounds are in the range 0-4096 by default: https://github.com/tilezen/mapbox-vector-tile
     # we want them to match our fixed imagery size of 256
-    pixel = round(b * 255. / 4096) # convert to tile pixels
-    flipped = pixel if (i % 2 == 0) else 255 - pixel # flip the y axis
-    return max(0, min(255, flipped)) # clamp to the correct range
+    coords = np.asarray(coords)
+    if np.issubdtype(coords.dtype, np.integer):
+        # clamping before the lookup gives the same result as clamping the pixels
+        pixels = tile_pixels[np.clip(coords, 0, 4096)] # convert to tile pixels
+        pixels[..., 1] = 255 - pixels[..., 1] # flip the y axis
+        return pixels
+    pixels = np.round(coords * 255. / 4096).astype(int) # convert to tile pixels
+    pixels[..., 1] = 255 - pixels[..., 1] # flip the y axis
+    return np.clip(pixels, 0, 255, out=pixels) # clamp to the correct range
 
 def _callback(tile_label):
     """Attach tile labels to a global tile_results dict"""
@@ -253,25 +294,19 @@ def _callback(tile_label):
     (tile, label) = tile_label
     tile_results[tile] = label
 
-def _done():
-    pass
-
-def _bbox_class(class_index):
-    """Create a function to determine if a bounding box label matches a given class"""
-    def bc(x):
-        """Determine if a bounding box label matches a given class"""
-        return x[4] == class_index
-    return bc
-
 def _tile_results_summary(ml_type, classes):
     print('---')
     labels = list(tile_results.values())
     all_tiles = list(tile_results.keys())
     if ml_type == 'object-detection':
+        # class index and tile index of every bounding box
+        box_classes = np.concatenate(labels)[:, 4] if labels else np.empty(0, dtype=int)
+        box_tiles = np.repeat(np.arange(len(labels)), [len(l) for l in labels])
         # for each class, show number of features and number of tiles
         for i, cl in enumerate(classes):
-            cl_features = len([bb for l in labels for bb in l if bb[4] == i])
-            cl_tiles = len([l for l in labels if len(list(filter(_bbox_class(i), l)))]) # pylint: disable=cell-var-from-loop
+            in_class = box_classes == i + 1
+            cl_features = int(np.sum(in_class))
+            cl_tiles = len(np.unique(box_tiles[in_class]))
             print('{}: {} features in {} tiles'.format(cl.get('name'), cl_features, cl_tiles))
     elif ml_type == 'classification':
         class_tile_counts = list(np.sum(labels, axis=0))
@@ -288,11 +323,5 @@ def _create_empty_label(ml_type, classes):
     elif ml_type == 'object-detection':
         return np.empty((0, 5), dtype=np.int)
     elif ml_type == 'segmentation':
-        return np.zeros((256, 256), dtype=np.int)
+        return np.zeros((256, 256), dtype=np.uint8)
     return None
-
-# Use with 'transform' to project to EPSG:4326
-project = partial(
-    pyproj.transform,
-    pyproj.Proj(init='epsg:3857'),
-    pyproj.Proj(init='epsg:4326'))
@@ -0,0 +1,90 @@
+"""Test that tiles are read and labelled by the label_maker tile workers"""
+import gzip
+import sqlite3
+import unittest
+from os import path as op
+from tempfile import mkdtemp
+from shutil import rmtree
+from unittest import mock
+
+import numpy as np
+import mapbox_vector_tile
+from tilepie.reader import ExtractionError
+
+from label_maker import label
+
+
+class FakeReader(object):
+    """A stand-in for tilepie's MBTilesReader holding gzipped tiles keyed by (z, x, y)"""
+    def __init__(self, tiles):
+        self.tiles = tiles
+
+    def tile(self, z, x, y):
+        if (z, x, y) not in self.tiles:
+            raise ExtractionError('missing tile')
+        return self.tiles[(z, x, y)]
+
+
+class TestTileWorker(unittest.TestCase):
+    """Tests for the tile worker"""
+
+    def test_tile_worker(self):
+        """Test that a (z, x, y) tile is read, uncompressed and passed to the mapper as x, y, z"""
+        reader = FakeReader({(12, 1, 2): gzip.compress(b'vector tile')})
+        args = dict(ml_type='classification', classes=[])
+        with mock.patch.object(label, 'worker_tiles', reader), \
+                mock.patch.object(label, '_mapper', return_value='label') as mapper:
+            self.assertEqual(label._tile_worker((12, 1, 2), args), 'label')
+        mapper.assert_called_once_with(1, 2, 12, b'vector tile', args)
+
+    def test_tile_worker_missing_tile(self):
+        """Test that tiles missing from the mbtiles file are skipped"""
+        with mock.patch.object(label, 'worker_tiles', FakeReader({})), \
+                mock.patch.object(label, '_mapper') as mapper:
+            self.assertIsNone(label._tile_worker((12, 1, 2), {}))
+        mapper.assert_not_called()
+
+
+class TestMakeLabels(unittest.TestCase):
+    """Tests for make_labels reading an mbtiles file"""
+
+    def setUp(self):
+        self.dest_folder = mkdtemp()
+        self.addCleanup(rmtree, self.dest_folder)
+        label.tile_results.clear()
+        self.addCleanup(label.tile_results.clear)
+
+    def test_make_labels_classification(self):
+        """Test that every tile in the bounding box is labelled from the mbtiles file"""
+        zoom = 1
+        # the tile x=1, y=0 at zoom 1 holds a building, the other tiles are missing
+        data = mapbox_vector_tile.encode([{
+            'name': 'osm',
+            'features': [{
+                'geometry': 'POLYGON ((0 0, 0 2048, 2048 2048, 2048 0, 0 0))',
+                'properties': {'building': 'yes'}
+            }]
+        }])
+        mbtiles = op.join(self.dest_folder, 'test-z{}.mbtiles'.format(zoom))
+        con = sqlite3.connect(mbtiles)
+        con.execute('CREATE TABLE tiles (zoom_level integer, tile_column integer, '
+                    'tile_row integer, tile_data blob)')
+        # mbtiles rows are in TMS order: flip y
+        con.execute('INSERT INTO tiles VALUES (?, ?, ?, ?)',
+                    (zoom, 1, 2 ** zoom - 1, gzip.compress(data)))
+        con.commit()
+        con.close()
+
+        classes = [{'name': 'Buildings', 'filter': ['has', 'building']}]
+        label.make_labels(self.dest_folder, zoom, 'test', classes, 'classification',
+                          [-179, -80, 179, 80], False)
+
+        labels = np.load(op.join(self.dest_folder, 'labels.npz'))
+        self.assertEqual(sorted(labels.files), ['0-0-1', '0-1-1', '1-0-1', '1-1-1'])
+        self.assertEqual(labels['1-0-1'].tolist(), [0, 1])
+        for tile in ['0-0-1', '0-1-1', '1-1-1']:
+            self.assertEqual(labels[tile].tolist(), [1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -72,14 +72,11 @@ class TeseIssueList(testing_setup.DiffgramBaseTestCase):
         )
         regular_methods.commit_with_rollback(self.session)
 
-        request_data = {}
-
         endpoint = f"/api/v1/project/{self.project.project_string_id}/issues/{str(discussion.id)}"
         auth_api = common_actions.create_project_auth(project = job.project, session = self.session)
         credentials = b64encode(f"{auth_api.client_id}:{auth_api.client_secret}".encode()).decode('utf-8')
         response_with_task_id = self.client.get(
             endpoint,
-            data = json.dumps(request_data),
             headers = {
                 'directory_id': str(job.project.directory_default_id),
                 'Authorization': f"Basic {credentials}"
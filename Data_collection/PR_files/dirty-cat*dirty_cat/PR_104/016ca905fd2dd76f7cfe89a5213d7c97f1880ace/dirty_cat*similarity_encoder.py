@@ -1,7 +1,6 @@
 import warnings
 
 import numpy as np
-from scipy import sparse
 from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
 from sklearn.preprocessing._encoders import _BaseEncoder
 from sklearn.cluster import KMeans
@@ -21,7 +20,7 @@ def ngram_similarity(X, cats, ngram_range, hashing_dim, dtype=np.float64):
         ||min(ci, cj)||_1 / (||ci||_1 + ||cj||_1 - ||min(ci, cj)||_1)
     """
     min_n, max_n = ngram_range
-    unq_X = np.unique(X)
+    unq_X, unq_idx = np.unique(X, return_inverse=True)
     cats = np.array([' %s ' % cat for cat in cats])
     unq_X_ = np.array([' %s ' % x for x in unq_X])
     if not hashing_dim:
@@ -32,18 +31,17 @@ def ngram_similarity(X, cats, ngram_range, hashing_dim, dtype=np.float64):
     vectorizer.fit(np.concatenate((cats, unq_X_)))
     count2 = vectorizer.transform(cats)
     count1 = vectorizer.transform(unq_X_)
-    sum2 = count2.sum(axis=1)
-    SE_dict = {}
-    for i, x in enumerate(count1):
-        aux = sparse.csr_matrix(np.ones((count2.shape[0], 1))).dot(x)
-        samegrams = count2.minimum(aux).sum(axis=1)
-        allgrams = x.sum() + sum2 - samegrams
+    # ||min(ci, cj)||_1 is the number of thresholds t such that both counts
+    # are >= t, summed over the ngrams: one sparse product per threshold
+    max_count = min(count1.max(), count2.max())
+    samegrams = np.zeros((count1.shape[0], count2.shape[0]))
+    for t in range(1, int(max_count) + 1):
+        samegrams += ((count1 >= t).astype(np.float64) *
+                      (count2 >= t).astype(np.float64).T).toarray()
+    allgrams = np.asarray(count1.sum(axis=1)) + np.asarray(count2.sum(axis=1)).T - samegrams
+    with np.errstate(divide='ignore', invalid='ignore'):
         similarity = np.divide(samegrams, allgrams)
-        SE_dict[unq_X[i]] = np.array(similarity).reshape(-1)
-    out = []
-    for x in X:
-        out.append(SE_dict[x])
-    return np.nan_to_num(np.vstack(out))
+    return np.nan_to_num(similarity[unq_idx])
 
 
 def get_prototype_frequencies(prototypes):
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 from dirty_cat import similarity_encoder, string_distances
 from dirty_cat.similarity_encoder import get_kmeans_protoypes
@@ -16,13 +17,18 @@ def _test_similarity(similarity, similarity_f, hashing_dim=None, categories='aut
         encoder = model.fit(X).transform(X_test)
 
         ans = np.zeros((len(X_test), len(X)))
-        for i, x_t in enumerate(X_test.reshape(-1)):
-            for j, x in enumerate(X.reshape(-1)):
-                if similarity == 'ngram':
+        for i, x_t in enumerate(X_test.reshape(-1).tolist()):
+            for j, x in enumerate(X.reshape(-1).tolist()):
+                # all the similarities are 1 for identical non empty strings
+                if x_t == x:
+                    ans[i, j] = 1.
+                elif similarity == 'ngram':
                     ans[i, j] = similarity_f(x_t, x, 3)
                 else:
                     ans[i, j] = similarity_f(x_t, x)
-        assert np.array_equal(encoder, ans)
+        # the encoder may compute the similarities in a different order
+        assert encoder.shape == ans.shape
+        assert np.allclose(encoder, ans)
     else:
         X = np.array(['aac', 'aaa', 'aaab', 'aaa', 'aaab', 'aaa', 'aaab', 'aaa']).reshape(-1, 1)
         X_test = np.array([['Aa', 'aAa', 'aaa', 'aaab', ' aaa  c']]).reshape(-1, 1)
@@ -36,44 +42,46 @@ def _test_similarity(similarity, similarity_f, hashing_dim=None, categories='aut
             return
 
         encoder = model.fit(X).transform(X_test)
+        assert len(model.categories_) == 1
         if n_prototypes == 1:
-            assert (model.categories_ == ['aaa'])
+            assert list(model.categories_[0]) == ['aaa']
         elif n_prototypes == 2:
-            a = [np.array(['aaa', 'aaab'], dtype='<U4')]
-            assert (np.array_equal(a, model.categories_))
+            assert list(model.categories_[0]) == ['aaa', 'aaab']
         elif n_prototypes == 3:
-            a = [np.array(['aaa', 'aaab', 'aac'], dtype='<U4')]
-            assert (np.array_equal(a, model.categories_))
+            assert list(model.categories_[0]) == ['aaa', 'aaab', 'aac']
 
-        ans = np.zeros((len(X_test), len(np.array(model.categories_).reshape(-1))))
-        for i, x_t in enumerate(X_test.reshape(-1)):
-            for j, x in enumerate(np.array(model.categories_).reshape(-1)):
-                if similarity == 'ngram':
+        cats = np.array(model.categories_).reshape(-1).tolist()
+        ans = np.zeros((len(X_test), len(cats)))
+        for i, x_t in enumerate(X_test.reshape(-1).tolist()):
+            for j, x in enumerate(cats):
+                # all the similarities are 1 for identical non empty strings
+                if x_t == x:
+                    ans[i, j] = 1.
+                elif similarity == 'ngram':
                     ans[i, j] = similarity_f(x_t, x, 3)
                 else:
                     ans[i, j] = similarity_f(x_t, x)
 
-        assert np.array_equal(encoder, ans)
+        # the encoder may compute the similarities in a different order
+        assert encoder.shape == ans.shape
+        assert np.allclose(encoder, ans)
 
 
-def test_similarity_encoder():
-    categories = ['auto', 'most_frequent', 'k-means']
-    for category in categories:
-        if category == 'auto':
-            _test_similarity('levenshtein-ratio', string_distances.levenshtein_ratio, categories=category,
-                             n_prototypes=None)
-            _test_similarity('jaro-winkler', string_distances.jaro_winkler, categories=category, n_prototypes=None)
-            _test_similarity('jaro', string_distances.jaro, categories=category, n_prototypes=None)
-            _test_similarity('ngram', string_distances.ngram_similarity, categories=category, n_prototypes=None)
-            _test_similarity('ngram', string_distances.ngram_similarity, hashing_dim=2**16, categories=category)
-        else:
-            for i in range(1, 4):
-                _test_similarity('levenshtein-ratio', string_distances.levenshtein_ratio, categories=category,
-                                 n_prototypes=i)
-                _test_similarity('jaro-winkler', string_distances.jaro_winkler, categories=category, n_prototypes=i)
-                _test_similarity('jaro', string_distances.jaro, categories=category, n_prototypes=i)
-                _test_similarity('ngram', string_distances.ngram_similarity, categories=category, n_prototypes=i)
-                _test_similarity('ngram', string_distances.ngram_similarity, hashing_dim=2**16, categories=category, n_prototypes=i)
+@pytest.mark.parametrize('categories, n_prototypes',
+                         [('auto', None)] +
+                         [(category, i)
+                          for category in ['most_frequent', 'k-means']
+                          for i in range(1, 4)])
+@pytest.mark.parametrize('similarity, similarity_f, hashing_dim', [
+    ('levenshtein-ratio', string_distances.levenshtein_ratio, None),
+    ('jaro-winkler', string_distances.jaro_winkler, None),
+    ('jaro', string_distances.jaro, None),
+    ('ngram', string_distances.ngram_similarity, None),
+    ('ngram', string_distances.ngram_similarity, 2**16),
+])
+def test_similarity_encoder(similarity, similarity_f, hashing_dim, categories, n_prototypes):
+    _test_similarity(similarity, similarity_f, hashing_dim=hashing_dim, categories=categories,
+                     n_prototypes=n_prototypes)
 
 
 def test_kmeans_protoypes():
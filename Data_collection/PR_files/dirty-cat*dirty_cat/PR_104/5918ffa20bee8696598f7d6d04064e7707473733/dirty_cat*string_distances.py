@@ -118,15 +118,49 @@ def levenshtein_seq(seq1, seq2):
     return thisrow[len_seq2 - 1]
 
 
+def levenshtein_bitparallel(seq1, seq2):
+    # Bit-parallel algorithm of Myers (1999), in the formulation of
+    # Hyyrö (2001): a column of the dynamic programming matrix is encoded
+    # as bit vectors of vertical +1/-1 deltas and updated with a few
+    # integer operations per item of the second sequence. Python integers
+    # have arbitrary precision, so there is no limit on the length.
+    if len(seq1) < len(seq2):
+        seq1, seq2 = seq2, seq1
+    # So now we have len(seq1) >= len(seq2), use the shortest as pattern.
+    pattern_size = len(seq2)
+    if pattern_size == 0:
+        return len(seq1)
+
+    # Bit masks of the positions of each item in the pattern
+    peq = {}
+    for i, c in enumerate(seq2):
+        peq[c] = peq.get(c, 0) | (1 << i)
+
+    mask = (1 << pattern_size) - 1
+    last = 1 << (pattern_size - 1)
+    vp, vn = mask, 0
+    score = pattern_size
+    for c in seq1:
+        eq = peq.get(c, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        hp = vn | ~(xh | vp)
+        hn = vp & xh
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+        hp = (hp << 1) | 1
+        hn = hn << 1
+        vp = (hn | ~(xv | hp)) & mask
+        vn = hp & xv
+    return score
+
+
 def levenshtein(seq1, seq2):
-    # Choose the fastest option depending on the size of the arrays
-    # The number 15 was chosen empirically on Python 3.6
     if _LEVENSHTEIN_AVAILABLE:
         return Levenshtein.distance(seq1, seq2)
-    if len(seq1) < 15:
-        return levenshtein_seq(seq1, seq2)
-    else:
-        return levenshtein_array(seq1, seq2)
+    return levenshtein_bitparallel(seq1, seq2)
 
 
 def _levenshtein_ratio(seq1, seq2):
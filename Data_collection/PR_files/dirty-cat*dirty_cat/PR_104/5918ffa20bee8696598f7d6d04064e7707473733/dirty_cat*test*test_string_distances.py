@@ -0,0 +1,24 @@
+from dirty_cat import string_distances
+
+
+def _levenshtein_reference(seq1, seq2):
+    # Full dynamic programming matrix
+    previous_row = list(range(len(seq2) + 1))
+    for i, c1 in enumerate(seq1, 1):
+        current_row = [i]
+        for j, c2 in enumerate(seq2, 1):
+            current_row.append(min(previous_row[j] + 1,
+                                   current_row[j - 1] + 1,
+                                   previous_row[j - 1] + (c1 != c2)))
+        previous_row = current_row
+    return previous_row[-1]
+
+
+def test_levenshtein_bitparallel():
+    strings = ['', 'a', 'aa', 'aaa', 'aaab', 'Aa', 'aAa', ' aaa  c',
+               'kitten', 'sitting', 'ccaa ccbac  bbc', 'a   a  a cccac  c',
+               'abcdefghij' * 10, 'abcdxfghij' * 10]
+    for seq1 in strings:
+        for seq2 in strings:
+            assert (string_distances.levenshtein_bitparallel(seq1, seq2) ==
+                    _levenshtein_reference(seq1, seq2))
@@ -61,8 +61,8 @@ author = u'dirty_cat developers'
 # built documents.
 #
 # The short X.Y version.
-version_file = os.path.join(
-    '..', 'dirty_cat', 'VERSION.txt')
+version_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            '..', 'dirty_cat', 'VERSION.txt')
 with open(version_file) as fh:
     version = fh.read().strip()
 # The full version, including alpha/beta/rc tags.
@@ -224,7 +224,7 @@ from sphinx_gallery.sorting import FileNameSortKey
 sphinx_gallery_conf = {
     'doc_module': 'dirty_cat',
     'filename_pattern': '',
-    'backreferences_dir': os.path.join('generated'),
+    'backreferences_dir': 'generated',
     'reference_url': {
         'dirty_cat': None,
         'numpy': 'http://docs.scipy.org/doc/numpy',
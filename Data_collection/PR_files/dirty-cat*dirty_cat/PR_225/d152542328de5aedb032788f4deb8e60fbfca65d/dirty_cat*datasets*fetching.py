@@ -15,16 +15,20 @@ Scikit-Learn's ``fetch_openml()`` function.
 # as of january 2021, the function is marked as experimental.
 
 
+import functools
 import gzip
 import json
+import re
+import shutil
 import sklearn
+import threading
 import warnings
 import pandas as pd
 
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Union, Dict, Any, List
-from distutils.version import LooseVersion
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Dict, Any, List, Optional, Tuple
 
 from dirty_cat.datasets.utils import get_data_dir
 
@@ -55,17 +59,38 @@ EMPLOYEE_SALARIES_ID = 42125
 TRAFFIC_VIOLATIONS_ID = 42132
 DRUG_DIRECTORY_ID = 43044
 
+# Buffer size used when reading and writing the dataset files.
+# The default (8 KiB) results in a lot of small reads
+# while inflating large datasets.
+_BUFFER_SIZE = 128 * 1024
 
-@dataclass
+# ``fetch_openml()`` accepts ``as_frame`` since Scikit-Learn 0.22.
+_SKLEARN_HAS_AS_FRAME = tuple(
+    int(re.match(r"\d+", part).group())
+    for part in sklearn.__version__.split(".")[:2]
+) >= (0, 22)
+
+# Information returned by ``fetch_openml_dataset()``,
+# indexed by dataset ID and data directory.
+# Allows skipping the details file on subsequent calls,
+# as long as the CSV file still exists.
+_OPENML_RESULT_CACHE: Dict[Tuple[int, Path], dict] = {}
+
+# Held while the caches above and the ``lru_cache`` of the readers
+# are invalidated, as ``prefetch_all()`` downloads from several threads.
+_OPENML_CACHE_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
 class Details:
     name: str
     file_id: int
     description: str
 
 
-@dataclass
+@dataclass(frozen=True)
 class Features:
-    names: List[str]
+    names: Tuple[str, ...]
 
 
 @dataclass
@@ -134,7 +159,7 @@ class DatasetInfoOnly:
 
 
 def fetch_openml_dataset(dataset_id: int,
-                         data_directory: Path = get_data_dir()) -> dict:
+                         data_directory: Optional[Path] = None) -> dict:
     """
     Gets a dataset from OpenML (https://www.openml.org),
     or from the disk if already downloaded.
@@ -143,9 +168,9 @@ def fetch_openml_dataset(dataset_id: int,
     ----------
     dataset_id: int
         The ID of the dataset to fetch.
-    data_directory: Path
+    data_directory: Optional[Path]
         Optional. A directory to save the data to.
-        By default, the dirty_cat data directory.
+        By default (None), the dirty_cat data directory.
 
     Returns
     -------
@@ -171,13 +196,21 @@ def fetch_openml_dataset(dataset_id: int,
               The name of `y`, the target column.
 
     """
+    if data_directory is None:
+        data_directory = get_data_dir()
     # Make path absolute
     data_directory = data_directory.resolve()
 
+    cache_key = (dataset_id, data_directory)
+    cached = _OPENML_RESULT_CACHE.get(cache_key)
+    if cached is not None and cached["path"].is_file():
+        return dict(cached)
+
     # Construct the path to the gzip file containing the details on a dataset.
     details_gz_path = data_directory / DETAILS_DIRECTORY / f'{dataset_id}.gz'
     features_gz_path = data_directory / FEATURES_DIRECTORY / f'{dataset_id}.gz'
 
+    downloaded = False
     if not details_gz_path.is_file() or not features_gz_path.is_file():
         # If the details file or the features file don't exist,
         # download the dataset.
@@ -190,6 +223,7 @@ def fetch_openml_dataset(dataset_id: int,
         )
         _download_and_write_openml_dataset(dataset_id=dataset_id,
                                            data_directory=data_directory)
+        downloaded = True
     details = _get_details(details_gz_path)
 
     # The file ID is required because the data file is named after this ID,
@@ -199,9 +233,10 @@ def fetch_openml_dataset(dataset_id: int,
 
     data_gz_path = data_directory / DATA_DIRECTORY / f'{file_id}.gz'
 
-    if not data_gz_path.is_file():
-        # This is a double-check.
-        # If the data file does not exist, download the dataset.
+    if not downloaded and not data_gz_path.is_file():
+        # The data file is named after the file ID, which we only know
+        # once the details are read: check it here, unless the dataset
+        # was just downloaded (in which case it is already there).
         _download_and_write_openml_dataset(dataset_id=dataset_id,
                                            data_directory=data_directory)
 
@@ -213,11 +248,55 @@ def fetch_openml_dataset(dataset_id: int,
 
     url = openml_url.format(ID=dataset_id)
 
-    return {
+    result = {
         "description": details.description,
         "source": url,
         "path": csv_path.resolve()
     }
+    _OPENML_RESULT_CACHE[cache_key] = result
+    return dict(result)
+
+
+def prefetch_all(dataset_ids: List[int],
+                 data_directory: Optional[Path] = None,
+                 max_workers: int = 4) -> List[dict]:
+    """
+    Fetches several datasets from OpenML concurrently,
+    so that subsequent calls to the fetchers only read them from the disk.
+    Downloading is mostly waiting on the network,
+    so running the fetches in threads makes them overlap.
+
+    Parameters
+    ----------
+    dataset_ids: List[int]
+        The IDs of the datasets to fetch,
+        e.g. ``[EMPLOYEE_SALARIES_ID, ROAD_SAFETY_ID]``.
+    data_directory: Optional[Path]
+        Optional. A directory to save the data to.
+        By default (None), the dirty_cat data directory.
+    max_workers: int
+        Maximum number of datasets fetched at the same time.
+
+    Returns
+    -------
+    List[dict]
+        The information returned by ``fetch_openml_dataset()``
+        for each dataset, in the same order as ``dataset_ids``.
+        An ID passed several times is only fetched once.
+
+    """
+    if not dataset_ids:
+        return []
+    # Two threads fetching the same dataset would write the same files.
+    unique_ids = list(dict.fromkeys(dataset_ids))
+    with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(unique_ids))) as executor:
+        results = dict(zip(unique_ids, executor.map(
+            lambda dataset_id: fetch_openml_dataset(dataset_id,
+                                                    data_directory),
+            unique_ids,
+        )))
+    return [dict(results[dataset_id]) for dataset_id in dataset_ids]
 
 
 def _download_and_write_openml_dataset(dataset_id: int,
@@ -243,9 +322,15 @@ def _download_and_write_openml_dataset(dataset_id: int,
     """
     from sklearn.datasets import fetch_openml
 
+    # The files are about to be (re)written: forget what we knew about them.
+    with _OPENML_CACHE_LOCK:
+        _OPENML_RESULT_CACHE.pop((dataset_id, data_directory), None)
+        _get_details.cache_clear()
+        _get_features.cache_clear()
+
     fetch_kwargs = {}
-    if LooseVersion(sklearn.__version__) >= LooseVersion('0.22'):
-        fetch_kwargs.update({'as_frame': True})
+    if _SKLEARN_HAS_AS_FRAME:
+        fetch_kwargs['as_frame'] = True
 
     # The ``fetch_openml()`` function returns a Scikit-Learn ``Bunch`` object,
     # which behaves just like a ``namedtuple``.
@@ -281,17 +366,16 @@ def _read_json_from_gz(compressed_dir_path: Path) -> dict:
     if not compressed_dir_path.is_file():
         raise FileNotFoundError(f"Couldn't find file {compressed_dir_path!s}")
 
-    # Read content
-    with gzip.open(compressed_dir_path, mode='rt') as gz:
-        content = gz.read()
-
-    details_json = json.JSONDecoder().decode(content)
-    return details_json
+    with compressed_dir_path.open(mode='rb', buffering=_BUFFER_SIZE) as raw:
+        with gzip.open(raw, mode='rt', encoding='utf8') as gz:
+            return json.load(gz)
 
 
+@functools.lru_cache(maxsize=32)
 def _get_details(compressed_dir_path: Path) -> Details:
     """
     Gets useful details from the details file.
+    The result is cached, as the file does not change once downloaded.
 
     Parameters
     ----------
@@ -308,18 +392,19 @@ def _get_details(compressed_dir_path: Path) -> Details:
     # We filter out the irrelevant information.
     # If you want to modify this list (to add or remove items)
     # you must also modify the ``Details`` object definition.
-    f_details = {
-        "name": details["name"],
-        "file_id": details["file_id"],
-        "description": details["description"],
-    }
-    return Details(*f_details.values())
+    return Details(
+        name=details["name"],
+        file_id=details["file_id"],
+        description=details["description"],
+    )
 
 
+@functools.lru_cache(maxsize=32)
 def _get_features(compressed_dir_path: Path) -> Features:
     """
     Gets features that can be inserted in the CSV file.
     The most important feature being the column names.
+    The result is cached, as the file does not change once downloaded.
 
     Parameters
     ----------
@@ -336,10 +421,9 @@ def _get_features(compressed_dir_path: Path) -> Features:
     # We filter out the irrelevant information.
     # If you want to modify this list (to add or remove items)
     # you must also modify the ``Features`` object definition.
-    features = {
-        "names": [column["name"] for column in raw_features["feature"]]
-    }
-    return Features(*features.values())
+    return Features(
+        names=tuple(column["name"] for column in raw_features["feature"]),
+    )
 
 
 def _export_gz_data_to_csv(compressed_dir_path: Path,
@@ -358,23 +442,20 @@ def _export_gz_data_to_csv(compressed_dir_path: Path,
         A ``Features`` object containing the first CSV line (the column names).
 
     """
-    atdata_found = False
-    with destination_file.open(mode="w", encoding='utf8') as csv:
-        with gzip.open(compressed_dir_path, mode="rt", encoding='utf8') as gz:
-            csv.write(_features_to_csv_format(features))
-            csv.write("\n")
+    # The files are handled in binary mode: the ARFF data is already
+    # UTF-8 encoded, so there is no need to decode and re-encode it.
+    with compressed_dir_path.open(mode="rb", buffering=_BUFFER_SIZE) as raw, \
+            destination_file.open(mode="wb", buffering=_BUFFER_SIZE) as csv:
+        with gzip.open(raw, mode="rb") as gz:
+            csv.write((",".join(features.names) + "\n").encode('utf8'))
             # We will look at each line of the file until we find
             # "@data": only after this tag is the actual CSV data.
-            for line in gz.readlines():
-                if not atdata_found:
-                    if line.lower().startswith("@data"):
-                        atdata_found = True
-                else:
-                    csv.write(line)
-
-
-def _features_to_csv_format(features: Features) -> str:
-    return ",".join(features.names)
+            for line in gz:
+                if line[:5].lower() == b"@data":
+                    break
+            # The rest of the file is copied as is, by chunks,
+            # instead of being split into lines.
+            shutil.copyfileobj(gz, csv, length=_BUFFER_SIZE)
 
 
 def fetch_dataset_as_namedtuple(dataset_id: int, target: str,
@@ -390,6 +471,7 @@ def fetch_dataset_as_namedtuple(dataset_id: int, target: str,
 def fetch_dataset_as_dataclass(dataset_id: int, target: str,
                                read_csv_kwargs: dict,
                                load_dataframe: bool,
+                               drop_columns: Optional[List[str]] = None,
                                ) -> Union[DatasetAll, DatasetInfoOnly]:
     """
     Takes a dataset identifier, a target column name,
@@ -398,6 +480,9 @@ def fetch_dataset_as_dataclass(dataset_id: int, target: str,
     If you don't need the dataset to be loaded in memory,
     pass `load_dataframe=False`.
 
+    Columns listed in `drop_columns` are skipped when reading the CSV,
+    and are therefore not present in `X`.
+
     Returns
     -------
     DatasetAll
@@ -409,12 +494,17 @@ def fetch_dataset_as_dataclass(dataset_id: int, target: str,
     """
     info = fetch_openml_dataset(dataset_id)
     if load_dataframe:
+        if drop_columns:
+            drop_columns = set(drop_columns)
+            read_csv_kwargs = dict(
+                read_csv_kwargs,
+                usecols=lambda column: column not in drop_columns,
+            )
         df = pd.read_csv(info['path'], **read_csv_kwargs)
-        y = df[target]
-        X = df.drop(target, axis='columns')
+        y = df.pop(target)
         dataset = DatasetAll(
             description=info['description'],
-            X=X,
+            X=df,
             y=y,
             source=info['source'],
             path=info['path'],
@@ -462,7 +552,13 @@ def fetch_employee_salaries(load_dataframe: bool = True,
     --------
     dirty_cat.datasets.fetch_dataset_as_namedtuple : additional information
     """
-    dataset = fetch_dataset_as_dataclass(
+    drop_columns = []
+    if drop_linked:
+        drop_columns.extend(["2016_gross_pay_received", "2016_overtime_pay"])
+    if drop_irrelevant:
+        drop_columns.append("full_name")
+
+    return fetch_dataset_as_dataclass(
         dataset_id=EMPLOYEE_SALARIES_ID,
         target='current_annual_salary',
         read_csv_kwargs={
@@ -471,15 +567,8 @@ def fetch_employee_salaries(load_dataframe: bool = True,
             'na_values': ['?'],
         },
         load_dataframe=load_dataframe,
+        drop_columns=drop_columns,
     )
-    if load_dataframe:
-        if drop_linked:
-            dataset.X.drop(["2016_gross_pay_received", "2016_overtime_pay"],
-                           axis=1, inplace=True)
-        if drop_irrelevant:
-            dataset.X.drop(["full_name"], axis=1, inplace=True)
-
-    return dataset
 
 
 def fetch_road_safety(load_dataframe: bool = True,
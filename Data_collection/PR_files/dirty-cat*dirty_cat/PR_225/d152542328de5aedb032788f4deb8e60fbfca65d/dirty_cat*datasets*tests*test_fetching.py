@@ -10,12 +10,10 @@ Tests fetching.py (datasets fetching off OpenML.org).
 
 import pytest
 import shutil
-import sklearn
 import warnings
 import pandas as pd
 
 from pathlib import Path
-from distutils.version import LooseVersion
 
 from unittest import mock
 from unittest.mock import mock_open
@@ -112,8 +110,8 @@ def test_fetch_openml_dataset_mocked(mock_download, mock_export,
 
     mock_get_details.return_value = Details("Dataset_name", "123456",
                                             "Dummy dataset description.")
-    mock_get_features.return_value = Features(["id", "name", "transaction_id",
-                                               "owner", "recipient"])
+    mock_get_features.return_value = Features(("id", "name", "transaction_id",
+                                               "owner", "recipient"))
 
     test_data_dir = get_test_data_dir()
 
@@ -135,24 +133,86 @@ def test_fetch_openml_dataset_mocked(mock_download, mock_export,
 
     fetch_openml_dataset(50, test_data_dir)
 
-    # Download should be called twice
-    mock_download.assert_called_with(dataset_id=50,
-                                     data_directory=get_test_data_dir())
+    # Download should be called only once
+    mock_download.assert_called_once_with(dataset_id=50,
+                                          data_directory=get_test_data_dir())
     mock_export.assert_called_once()
     mock_get_features.assert_called_once()
     mock_get_details.assert_called_once()
 
 
+@mock.patch("pathlib.Path.is_file")
+@mock.patch("dirty_cat.datasets.fetching._get_details")
+def test_fetch_openml_dataset_cached(mock_get_details,
+                                     mock_pathlib_path_isfile):
+    """
+    Tests that ``fetch_openml_dataset()`` does not read the details file
+    again when called twice for the same dataset.
+    """
+
+    from dirty_cat.datasets.fetching import fetch_openml_dataset, Details, \
+        _OPENML_RESULT_CACHE
+
+    mock_get_details.return_value = Details("Dataset_name", "123456",
+                                            "Dummy dataset description.")
+    mock_pathlib_path_isfile.return_value = True
+
+    test_data_dir = get_test_data_dir()
+    _OPENML_RESULT_CACHE.clear()
+
+    try:
+        first = fetch_openml_dataset(50, test_data_dir)
+        second = fetch_openml_dataset(50, test_data_dir)
+        assert first == second
+        mock_get_details.assert_called_once()
+    finally:
+        _OPENML_RESULT_CACHE.clear()
+
+
+@mock.patch("dirty_cat.datasets.fetching.fetch_openml_dataset")
+def test_prefetch_all(mock_fetch_openml_dataset):
+    """Tests function ``prefetch_all()``."""
+
+    from dirty_cat.datasets.fetching import prefetch_all
+
+    mock_fetch_openml_dataset.side_effect = lambda dataset_id, _: {
+        "path": Path(f"/path/to/{dataset_id}.csv"),
+    }
+
+    test_data_dir = get_test_data_dir()
+    returned_value = prefetch_all([42, 50, 61], test_data_dir)
+
+    assert [info["path"] for info in returned_value] == [
+        Path("/path/to/42.csv"),
+        Path("/path/to/50.csv"),
+        Path("/path/to/61.csv"),
+    ]
+    assert mock_fetch_openml_dataset.call_count == 3
+    assert prefetch_all([]) == []
+
+    # Duplicated IDs are fetched once, but still returned at each position.
+    mock_fetch_openml_dataset.reset_mock()
+    returned_value = prefetch_all([61, 42, 61], test_data_dir)
+    assert [info["path"] for info in returned_value] == [
+        Path("/path/to/61.csv"),
+        Path("/path/to/42.csv"),
+        Path("/path/to/61.csv"),
+    ]
+    assert returned_value[0] is not returned_value[2]
+    assert mock_fetch_openml_dataset.call_count == 2
+
+
 @mock.patch('sklearn.datasets.fetch_openml')
 def test__download_and_write_openml_dataset(mock_fetch_openml):
     """Tests function ``_download_and_write_openml_dataset()``."""
 
-    from dirty_cat.datasets.fetching import _download_and_write_openml_dataset
+    from dirty_cat.datasets.fetching import _download_and_write_openml_dataset, \
+        _SKLEARN_HAS_AS_FRAME
 
     test_data_dir = get_test_data_dir()
     _download_and_write_openml_dataset(1, test_data_dir)
 
-    if LooseVersion(sklearn.__version__) >= LooseVersion('0.22'):
+    if _SKLEARN_HAS_AS_FRAME:
         mock_fetch_openml.assert_called_once_with(data_id=1,
                                                   data_home=str(test_data_dir),
                                                   as_frame=True)
@@ -161,6 +221,7 @@ def test__download_and_write_openml_dataset(mock_fetch_openml):
                                                   data_home=str(test_data_dir))
 
 
+@mock.patch("pathlib.Path.open", mock_open())
 @mock.patch("pathlib.Path.is_file")
 def test__read_json_from_gz(mock_pathlib_path_isfile):
     """Tests function ``_read_json_from_gz()``."""
@@ -215,14 +276,45 @@ def test__get_details(mock_read_json_from_gz):
     assert returned_value == expected_return_value
 
 
+@mock.patch('sklearn.datasets.fetch_openml')
+@mock.patch("dirty_cat.datasets.fetching._read_json_from_gz")
+def test__get_details_cache_cleared_on_download(mock_read_json_from_gz,
+                                               mock_fetch_openml):
+    """
+    Tests that the details are read again from the disk
+    after the dataset is downloaded again.
+    """
+
+    from dirty_cat.datasets.fetching import _get_details, \
+        _download_and_write_openml_dataset
+
+    mock_read_json_from_gz.return_value = {
+        "data_set_description": {
+            "name": "Dataset_name",
+            "file_id": "123456",
+            "description": "Dummy dataset description.",
+        }
+    }
+
+    details_path = Path("/file/cached_details.gz")
+    _get_details.cache_clear()
+    _get_details(details_path)
+    _get_details(details_path)
+    assert mock_read_json_from_gz.call_count == 1
+
+    _download_and_write_openml_dataset(1, get_test_data_dir())
+    _get_details(details_path)
+    assert mock_read_json_from_gz.call_count == 2
+
+
 @mock.patch("dirty_cat.datasets.fetching._read_json_from_gz")
 def test__get_features(mock_read_json_from_gz):
     """Tests function ``_get_features()``."""
 
     from dirty_cat.datasets.fetching import Features, _get_features
 
-    expected_return_value = Features(["id", "name", "transaction_id",
-                                      "owner", "recipient"])
+    expected_return_value = Features(("id", "name", "transaction_id",
+                                      "owner", "recipient"))
 
     mock_read_json_from_gz.return_value = {
         "data_features": {
@@ -245,7 +337,7 @@ def test__export_gz_data_to_csv():
     """Tests function ``_export_gz_data_to_csv()``."""
     from dirty_cat.datasets.fetching import _export_gz_data_to_csv, Features
 
-    features = Features(["top-left-square",
+    features = Features(("top-left-square",
                          "top-middle-square",
                          "top-right-square",
                          "middle-left-square",
@@ -254,36 +346,31 @@ def test__export_gz_data_to_csv():
                          "bottom-left-square",
                          "bottom-middle-square",
                          "bottom-right-square",
-                         "Class"])
+                         "Class"))
     arff_data = (
-        "% This is a comment\n"
-        "@relation tic-tac-toe\n"
-        "@attribute 'top-left-square' {b,o,x}\n"
-        "@data\n"
-        "x,x,x,x,o,o,x,o,o,positive\n"
-        "x,x,x,x,o,o,o,x,o,positive\n"
+        b"% This is a comment\n"
+        b"@relation tic-tac-toe\n"
+        b"@attribute 'top-left-square' {b,o,x}\n"
+        b"@data\n"
+        b"x,x,x,x,o,o,x,o,o,positive\n"
+        b"x,x,x,x,o,o,o,x,o,positive\n"
     )
 
     dummy_gz = Path("/dummy/file.gz")
     dummy_csv = Path("/dummy/file.csv")
 
     with mock.patch("pathlib.Path.open",
-                    mock_open(read_data="")) as mock_pathlib_path_open:
+                    mock_open(read_data=b"")) as mock_pathlib_path_open:
         with mock.patch("gzip.open",
                         mock_open(read_data=arff_data)) as mock_gzip_open:
             _export_gz_data_to_csv(dummy_gz, dummy_csv, features)
-            mock_pathlib_path_open.assert_called_with(mode='w', encoding='utf8')
-            mock_gzip_open.assert_called_with(dummy_gz, mode='rt', encoding='utf8')
-
-
-def test__features_to_csv_format():
-    """Tests function ``_features_to_csv_format()``."""
-
-    from dirty_cat.datasets.fetching import Features, _features_to_csv_format
-
-    features = Features(["id", "name", "transaction_id", "owner", "recipient"])
-    expected_return_value = "id,name,transaction_id,owner,recipient"
-    assert _features_to_csv_format(features) == expected_return_value
+            mock_pathlib_path_open.assert_any_call(mode='rb',
+                                                   buffering=128 * 1024)
+            mock_pathlib_path_open.assert_called_with(mode='wb',
+                                                      buffering=128 * 1024)
+            mock_gzip_open.assert_called_with(
+                mock_pathlib_path_open.return_value, mode='rb',
+            )
 
 
 @mock.patch('dirty_cat.datasets.fetching.fetch_openml_dataset')
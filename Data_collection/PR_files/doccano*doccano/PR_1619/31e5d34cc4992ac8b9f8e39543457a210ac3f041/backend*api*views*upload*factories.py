@@ -2,55 +2,60 @@ from ...models import (DOCUMENT_CLASSIFICATION, IMAGE_CLASSIFICATION, SEQ2SEQ,
                        SEQUENCE_LABELING, SPEECH2TEXT)
 from . import builders, catalog, cleaners, data, label, parsers, readers
 
+_DATA_CLASS_TABLE = {
+    DOCUMENT_CLASSIFICATION: data.TextData,
+    SEQUENCE_LABELING: data.TextData,
+    SEQ2SEQ: data.TextData,
+}
+
+_PARSER_TABLE = {
+    catalog.TextFile.name: parsers.TextFileParser,
+    catalog.TextLine.name: parsers.LineParser,
+    catalog.CSV.name: parsers.CSVParser,
+    catalog.JSONL.name: parsers.JSONLParser,
+    catalog.JSON.name: parsers.JSONParser,
+    catalog.FastText.name: parsers.FastTextParser,
+    catalog.Excel.name: parsers.ExcelParser,
+    catalog.CoNLL.name: parsers.CoNLLParser,
+    catalog.ImageFile.name: parsers.PlainParser,
+    catalog.AudioFile.name: parsers.PlainParser,
+}
+
+_LABEL_TABLE = {
+    DOCUMENT_CLASSIFICATION: label.CategoryLabel,
+    SEQUENCE_LABELING: label.SpanLabel,
+    SEQ2SEQ: label.TextLabel,
+    IMAGE_CLASSIFICATION: label.CategoryLabel,
+    SPEECH2TEXT: label.TextLabel,
+}
+
+_CLEANER_TABLE = {
+    DOCUMENT_CLASSIFICATION: cleaners.CategoryCleaner,
+    SEQUENCE_LABELING: cleaners.SpanCleaner,
+    IMAGE_CLASSIFICATION: cleaners.CategoryCleaner
+}
+
 
 def get_data_class(project_type: str):
-    text_projects = [DOCUMENT_CLASSIFICATION, SEQUENCE_LABELING, SEQ2SEQ]
-    if project_type in text_projects:
-        return data.TextData
-    else:
-        return data.FileData
+    return _DATA_CLASS_TABLE.get(project_type, data.FileData)
 
 
 def create_parser(file_format: str, **kwargs):
-    mapping = {
-        catalog.TextFile.name: parsers.TextFileParser,
-        catalog.TextLine.name: parsers.LineParser,
-        catalog.CSV.name: parsers.CSVParser,
-        catalog.JSONL.name: parsers.JSONLParser,
-        catalog.JSON.name: parsers.JSONParser,
-        catalog.FastText.name: parsers.FastTextParser,
-        catalog.Excel.name: parsers.ExcelParser,
-        catalog.CoNLL.name: parsers.CoNLLParser,
-        catalog.ImageFile.name: parsers.PlainParser,
-        catalog.AudioFile.name: parsers.PlainParser,
-    }
-    if file_format not in mapping:
+    parser_class = _PARSER_TABLE.get(file_format)
+    if parser_class is None:
         raise ValueError(f'Invalid format: {file_format}')
-    return mapping[file_format](**kwargs)
+    return parser_class(**kwargs)
 
 
 def get_label_class(project_type: str):
-    mapping = {
-        DOCUMENT_CLASSIFICATION: label.CategoryLabel,
-        SEQUENCE_LABELING: label.SpanLabel,
-        SEQ2SEQ: label.TextLabel,
-        IMAGE_CLASSIFICATION: label.CategoryLabel,
-        SPEECH2TEXT: label.TextLabel,
-    }
-    if project_type not in mapping:
-        ValueError(f'Invalid project type: {project_type}')
-    return mapping[project_type]
+    label_class = _LABEL_TABLE.get(project_type)
+    if label_class is None:
+        raise ValueError(f'Invalid project type: {project_type}')
+    return label_class
 
 
 def create_cleaner(project):
-    mapping = {
-        DOCUMENT_CLASSIFICATION: cleaners.CategoryCleaner,
-        SEQUENCE_LABELING: cleaners.SpanCleaner,
-        IMAGE_CLASSIFICATION: cleaners.CategoryCleaner
-    }
-    if project.project_type not in mapping:
-        ValueError(f'Invalid project type: {project.project_type}')
-    cleaner_class = mapping.get(project.project_type, cleaners.Cleaner)
+    cleaner_class = _CLEANER_TABLE.get(project.project_type, cleaners.Cleaner)
     return cleaner_class(project)
 
 
@@ -35,6 +35,7 @@ def build_data(row: Dict[Any, Any], name: str, data_class: Type[BaseData], filen
 
 
 class Column(abc.ABC):
+    __slots__ = ('name', 'value_class')
 
     def __init__(self, name: str, value_class: Type[T]):
         self.name = name
@@ -46,12 +47,14 @@ class Column(abc.ABC):
 
 
 class DataColumn(Column):
+    __slots__ = ()
 
     def __call__(self, row: Dict[Any, Any], filename: str) -> BaseData:
         return build_data(row, self.name, self.value_class, filename)
 
 
 class LabelColumn(Column):
+    __slots__ = ()
 
     def __call__(self, row: Dict[Any, Any], filename: str) -> List[Label]:
         return build_label(row, self.name, self.value_class)